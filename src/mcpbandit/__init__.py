@@ -0,0 +1,24 @@
+import os
+
+# The bandit linear algebra runs on tiny (d <= ~16) matrices, where waking a
+# BLAS thread pool for every call costs more than the arithmetic itself. Pin
+# BLAS to one thread unless the user configured it; this must happen before
+# numpy is first imported to take effect.
+for _var in ("OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "OMP_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+del _var
+
+
+def limit_blas_threads(num_threads: int = 1) -> None:
+    """Limit the BLAS thread pools of the running process.
+
+    The environment defaults above have no effect if numpy was imported before
+    `mcpbandit`. Call this to apply the limit to already loaded BLAS libraries
+    instead. Requires the `blas` extra (`threadpoolctl`).
+
+    Args:
+        num_threads: Maximum number of BLAS threads.
+    """
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(num_threads, user_api="blas")
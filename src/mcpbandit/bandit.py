@@ -1,20 +1,89 @@
 from abc import ABC, abstractmethod
+import operator
 from dataclasses import dataclass, field
-from threading import RLock
+from threading import Lock, RLock
 from typing import Generic, TypeVar
+from numba import njit
 import numpy as np
 from numpy.typing import NDArray
+from scipy.linalg import cho_factor, cho_solve
+from scipy.linalg.blas import ssyr
 
 T = TypeVar("T")
 
+# Rows of standard normal noise drawn per refill of the Thompson sampling pool.
+_NOISE_POOL_ROWS = 4096
+
+
+@njit(cache=True)
+def _thompson_argmax(
+    L_stack: NDArray[np.float32],
+    mu_stack: NDArray[np.float32],
+    context: NDArray[np.float32],
+    z: NDArray[np.float32],
+    alpha: float,
+) -> int:
+    """Score every arm with a sampled parameter and return the best index.
+
+    For each arm the sample is `mu + alpha * w` where `L^T w = z`. The solve is
+    an inline back substitution that reads only the lower triangle of `L`; at
+    these dimensions that beats dispatching to LAPACK.
+    """
+    n_arms, d = mu_stack.shape
+    w = np.empty(d, dtype=np.float32)
+    best_index = 0
+    best_score = -np.inf
+    for k in range(n_arms):
+        for i in range(d - 1, -1, -1):
+            acc = z[k, i]
+            for j in range(i + 1, d):
+                acc -= L_stack[k, j, i] * w[j]
+            w[i] = acc / L_stack[k, i, i]
+        score = 0.0
+        for i in range(d):
+            score += context[i] * (mu_stack[k, i] + alpha * w[i])
+        if score > best_score:
+            best_score = score
+            best_index = k
+    return best_index
+
+
+@dataclass(frozen=True, eq=False)
+class ArmStatistics:
+    """Immutable snapshot of an arm's design matrix and response vector.
+
+    Only the lower triangle of the design matrix `A` is kept up to date, which
+    is all the Cholesky factorization reads. `version` counts the observations
+    folded in since the snapshot was initialized.
+    """
+
+    A: NDArray[np.float32]
+    b: NDArray[np.float32]
+    version: int = 0
+
+
+# (source statistics, cho_factor result, mu_hat, A^{-1})
+_Posterior = tuple[
+    ArmStatistics,
+    tuple[NDArray[np.float32], bool],
+    NDArray[np.float32],
+    NDArray[np.float32],
+]
+
 
 @dataclass
 class ArmState:
-    """Sufficient statistics for a single linear contextual bandit arm."""
+    """Sufficient statistics for a single linear contextual bandit arm.
 
-    L: NDArray[np.float64]
-    b: NDArray[np.float64]
-    _lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
+    Updates build a new `ArmStatistics` out of place and publish it with a
+    compare-and-swap, so readers only ever need a single reference read.
+    """
+
+    statistics: ArmStatistics
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
+    _posterior: _Posterior | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def initial(cls, context_length: int, lam: float = 1.0) -> "ArmState":
@@ -29,30 +98,90 @@ class ArmState:
                 adapt faster at the cost of being noisier at the beginning.
 
         Returns:
-            A new `ArmState` with initialized design matrix factor and response vector.
+            A new `ArmState` with initialized design matrix and response vector.
+        """
+        # Fortran order lets the BLAS rank-one update copy A without a transpose.
+        A = np.zeros((context_length, context_length), dtype=np.float32, order="F")
+        np.fill_diagonal(A, lam)
+        b = np.zeros(context_length, dtype=np.float32)
+        return cls(statistics=ArmStatistics(A=A, b=b))
+
+    @property
+    def A(self) -> NDArray[np.float32]:
+        """The full symmetric design matrix.
+
+        `statistics.A` only maintains the lower triangle, so this returns a
+        new array with it mirrored onto the upper triangle.
         """
-        L = np.sqrt(lam) * np.identity(context_length, dtype=np.float64)
-        b = np.zeros((context_length, 1), dtype=np.float64)
-        return cls(L=L, b=b)
+        A_lower = self.statistics.A
+        return np.tril(A_lower) + np.tril(A_lower, -1).T
 
-    def update(self, reward: float, context: NDArray[np.float64]) -> None:
+    @property
+    def b(self) -> NDArray[np.float32]:
+        return self.statistics.b
+
+    def update(self, reward: float, context: NDArray[np.float32]) -> None:
         """Thread-safe incorporation of a new (context, reward) observation."""
-        context_vec = context.reshape(-1, 1)
+        context = context.astype(np.float32, copy=False)
+        while True:
+            current = self.statistics
+            # One allocation per array of the new snapshot: ssyr copies A, and
+            # b is accumulated into the buffer holding reward * context.
+            b = np.multiply(context, reward, dtype=np.float32)
+            b += current.b
+            updated = ArmStatistics(
+                A=ssyr(1.0, context, lower=True, a=current.A),
+                b=b,
+                version=current.version + 1,
+            )
+            if self._compare_and_swap(current, updated):
+                return
+
+    def _compare_and_swap(
+        self, expected: ArmStatistics, updated: ArmStatistics
+    ) -> bool:
+        """Publish `updated` only if no other writer replaced `expected` first."""
         with self._lock:
-            self._cholesky_rank_one_update(context_vec)
-            self.b += reward * context_vec
-
-    def _cholesky_rank_one_update(self, x: NDArray[np.float64]) -> None:
-        """Apply an in-place rank-one update to the Cholesky factor."""
-        v = x.flatten().astype(np.float64, copy=True)
-        for i in range(self.L.shape[0]):
-            r = np.hypot(self.L[i, i], v[i])
-            c = r / self.L[i, i]
-            s = v[i] / self.L[i, i]
-            self.L[i, i] = r
-            if i + 1 < self.L.shape[0]:
-                self.L[i + 1 :, i] = (self.L[i + 1 :, i] + s * v[i + 1 :]) / c
-                v[i + 1 :] = c * v[i + 1 :] - s * self.L[i + 1 :, i]
+            if self.statistics is not expected:
+                return False
+            self.statistics = updated
+            return True
+
+    def _solve_posterior(self) -> _Posterior:
+        """Return the posterior for the current statistics, recomputing if stale.
+
+        The factorization and the solve for `A^{-1} b` and `A^{-1}` (as one
+        multi-RHS system) run outside any lock on the immutable snapshot.
+        """
+        statistics = self.statistics
+        posterior = self._posterior
+        if posterior is not None and posterior[0] is statistics:
+            return posterior
+
+        chol = cho_factor(statistics.A, lower=True, check_finite=False)
+        d = statistics.b.shape[0]
+        rhs = np.empty((d, d + 1), dtype=np.float32, order="F")
+        rhs[:, 0] = statistics.b
+        rhs[:, 1:] = np.identity(d, dtype=np.float32)
+        solution = cho_solve(chol, rhs, overwrite_b=True, check_finite=False)
+        posterior = (statistics, chol, solution[:, 0], solution[:, 1:])
+        self._posterior = posterior
+        return posterior
+
+    def get_mu_hat(self) -> NDArray[np.float32]:
+        """Return the posterior mean, recomputing it only after an update."""
+        return self._solve_posterior()[2]
+
+    def get_A_inv(self) -> NDArray[np.float32]:
+        """Return `A^{-1}`, recomputing it only after an update."""
+        return self._solve_posterior()[3]
+
+    def get_posterior(
+        self,
+    ) -> tuple[NDArray[np.float32], NDArray[np.float32], NDArray[np.float32]]:
+        """Return the Cholesky factor, posterior mean and `A^{-1}` consistently."""
+        _, chol, mu_hat, A_inv = self._solve_posterior()
+        return chol[0], mu_hat, A_inv
 
 
 @dataclass
@@ -67,11 +196,71 @@ class BanditRegistry(ABC, Generic[T]):
     context_length: int
     arms: list[Arm[T]] = field(default_factory=list)
     _lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
+    _snapshot: (
+        tuple[
+            tuple[ArmStatistics, ...],
+            tuple[Arm[T], ...],
+            NDArray[np.float32],
+            NDArray[np.float32],
+            NDArray[np.float32],
+        ]
+        | None
+    ) = field(default=None, init=False, repr=False, compare=False)
+
+    def _posterior_snapshot(
+        self,
+    ) -> tuple[
+        tuple[Arm[T], ...],
+        NDArray[np.float32],
+        NDArray[np.float32],
+        NDArray[np.float32],
+    ]:
+        """Capture the arms with their posterior statistics stacked.
 
-    def _arms_snapshot(self) -> list[Arm[T]]:
-        """Capture a thread-safe shallow copy of the arms list."""
+        Returns:
+            The arms together with a `(K, d, d)` stack of Cholesky factors
+            (only their lower triangles are meaningful),
+            a `(K, d)` stack of posterior means and a `(K, d, d)` stack of
+            `A^{-1}`. The stacks are keyed on the identity of every arm's
+            statistics snapshot, so they are rebuilt whenever an arm is added
+            or its state is updated, however that happens.
+        """
         with self._lock:
-            return list(self.arms)
+            arms = tuple(self.arms)
+            statistics = tuple(arm.state.statistics for arm in arms)
+            snapshot = self._snapshot
+            if (
+                snapshot is not None
+                and len(snapshot[0]) == len(statistics)
+                and all(map(operator.is_, snapshot[0], statistics))
+                and all(map(operator.is_, snapshot[1], arms))
+            ):
+                return snapshot[1:]
+
+            n_arms, d = len(arms), self.context_length
+            L_stack = np.empty((n_arms, d, d), dtype=np.float32)
+            mu_stack = np.empty((n_arms, d), dtype=np.float32)
+            A_inv_stack = np.empty((n_arms, d, d), dtype=np.float32)
+            for idx, arm in enumerate(arms):
+                L_stack[idx], mu_stack[idx], A_inv_stack[idx] = (
+                    arm.state.get_posterior()
+                )
+            self._snapshot = (statistics, arms, L_stack, mu_stack, A_inv_stack)
+            return self._snapshot[1:]
+
+    def _as_context(self, context: NDArray[np.float32]) -> NDArray[np.float32]:
+        """Cast `context` to float32 and check it has one value per feature.
+
+        Raises:
+            ValueError: If `context` is not a vector of length `context_length`.
+        """
+        context = np.asarray(context, dtype=np.float32)
+        if context.shape != (self.context_length,):
+            raise ValueError(
+                f"Expected a context of shape ({self.context_length},), "
+                f"got {context.shape}."
+            )
+        return context
 
     def add(self, body: T) -> None:
         """Add a new arm to the policy with initialized statistics."""
@@ -83,14 +272,15 @@ class BanditRegistry(ABC, Generic[T]):
             )
             self.arms.append(arm)
 
-    def observe(self, arm_id: int, reward: float, context: NDArray[np.float64]) -> None:
+    def observe(self, arm_id: int, reward: float, context: NDArray[np.float32]) -> None:
         """Update internal statistics after observing reward."""
+        context = self._as_context(context)
         with self._lock:
             arm = self.arms[arm_id]
         arm.state.update(reward, context)
 
     @abstractmethod
-    def select(self, context: NDArray[np.float64]) -> Arm[T]:
+    def select(self, context: NDArray[np.float32]) -> Arm[T]:
         """Choose an arm based on the provided context."""
         pass
 
@@ -107,28 +297,44 @@ class ThompsonSamplingRegistry(BanditRegistry[T], Generic[T]):
             greedily based on the current estimates. The default of 0.3 is a
             conservative choice that balances exploration and exploitation in
             many practical scenarios.
+        rng: Random generator for the sampling noise. Pass a seeded generator
+            (e.g. `np.random.default_rng(0)`) for reproducible decisions.
     """
 
     alpha: float = 0.3
+    rng: np.random.Generator = field(
+        default_factory=np.random.default_rng, repr=False, compare=False
+    )
+    _noise_pool: NDArray[np.float32] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _noise_offset: int = field(default=0, init=False, repr=False, compare=False)
+
+    def _draw_noise(self, n_arms: int) -> NDArray[np.float32]:
+        """Take `(n_arms, d)` standard normal draws from a pre-sampled pool.
+
+        The pool is refilled with a single RNG call once it runs out, so most
+        decisions only slice into it. Rows are handed out once and never reused.
+        """
+        with self._lock:
+            pool = self._noise_pool
+            if pool is None or self._noise_offset + n_arms > pool.shape[0]:
+                rows = max(_NOISE_POOL_ROWS, n_arms)
+                pool = self.rng.standard_normal(
+                    (rows, self.context_length), dtype=np.float32
+                )
+                self._noise_pool = pool
+                self._noise_offset = 0
+            start = self._noise_offset
+            self._noise_offset = start + n_arms
+            return pool[start : start + n_arms]
 
-    def select(self, context: NDArray[np.float64]) -> Arm[T]:
-        sampled_means: list[float] = []
-        context_vec = context.reshape(-1, 1)
-        arms = self._arms_snapshot()
-        for arm in arms:
-            with arm.state._lock:
-                y = np.linalg.solve(arm.state.L, arm.state.b)
-                mu_hat = np.linalg.solve(arm.state.L.T, y)
-
-                z = np.random.normal(size=mu_hat.shape)
-                perturbation = self.alpha * np.linalg.solve(arm.state.L.T, z)
-                sampled_theta = mu_hat + perturbation
-
-                sampled_mean = float((context_vec.T @ sampled_theta).item())
-                sampled_means.append(sampled_mean)
+    def select(self, context: NDArray[np.float32]) -> Arm[T]:
+        context = self._as_context(context)
+        arms, L_stack, mu_stack, _ = self._posterior_snapshot()
 
-        chosen_index = int(np.argmax(sampled_means))
-        return arms[chosen_index]
+        z = self._draw_noise(len(arms))
+        return arms[_thompson_argmax(L_stack, mu_stack, context, z, self.alpha)]
 
 
 @dataclass
@@ -146,7 +352,7 @@ class UCBRegistry(BanditRegistry[T], Generic[T]):
 
     alpha: float = 0.5
 
-    def select(self, context: NDArray[np.float64]) -> Arm[T]:
+    def select(self, context: NDArray[np.float32]) -> Arm[T]:
         """Compute upper confidence bounds and pick the arm with the highest score.
 
         Args:
@@ -155,20 +361,11 @@ class UCBRegistry(BanditRegistry[T], Generic[T]):
         Returns:
             The selected arm.
         """
-        ucb_values: list[float] = []
-        context_vec = context.reshape(-1, 1)
-        arms = self._arms_snapshot()
-        for arm in arms:
-            with arm.state._lock:
-                L_inv_b = np.linalg.solve(arm.state.L, arm.state.b)
-                mu_hat = np.linalg.solve(arm.state.L.T, L_inv_b)
-
-                L_inv_x = np.linalg.solve(arm.state.L, context_vec)  # L^{-1} x
-                uncertainty = np.sqrt(float((L_inv_x.T @ L_inv_x).item()))
-
-                ucb_value = (
-                    float((context_vec.T @ mu_hat).item()) + self.alpha * uncertainty
-                )
-                ucb_values.append(ucb_value)
-        chosen_index = int(np.argmax(ucb_values))
-        return arms[chosen_index]
+        context = self._as_context(context)
+        arms, _, mu_stack, A_inv_stack = self._posterior_snapshot()
+
+        # ||L^{-1} x||^2 = x^T A^{-1} x, with A^{-1} precomputed per arm
+        uncertainty = np.sqrt((A_inv_stack @ context) @ context)
+
+        ucb_values = mu_stack @ context + self.alpha * uncertainty
+        return arms[int(ucb_values.argmax())]
@@ -0,0 +1,65 @@
+import asyncio
+import functools
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    """Build a cache key that does not depend on keyword argument order."""
+    return (args, tuple(sorted(kwargs.items())))
+
+
+def async_lru_cache(
+    maxsize: int = 128,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Memoize an async function with a least-recently-used eviction policy.
+
+    Results are stored as `asyncio.Future` objects, so concurrent calls with the
+    same arguments share a single in-flight execution. That execution runs in
+    its own task, so cancelling one caller never cancels it for the others.
+    Calls that raise are removed from the cache and are retried on the next
+    call.
+
+    Args:
+        maxsize: Maximum number of entries kept before the least recently used
+            one is evicted.
+
+    Returns:
+        A decorator wrapping the coroutine function.
+    """
+
+    def decorator(fn: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        cache: OrderedDict[Hashable, asyncio.Future[R]] = OrderedDict()
+
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            key = _make_key(args, kwargs)
+            future = cache.get(key)
+            if future is not None:
+                cache.move_to_end(key)
+            else:
+                # Run the call in its own task so that cancelling any caller,
+                # including the first one, leaves the shared call running.
+                future = asyncio.ensure_future(fn(*args, **kwargs))
+                cache[key] = future
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+                def evict_on_failure(done: asyncio.Future[R]) -> None:
+                    # exception() also marks the error as retrieved, so a call
+                    # whose callers were all cancelled does not log a warning.
+                    failed = done.cancelled() or done.exception() is not None
+                    if failed and cache.get(key) is done:
+                        del cache[key]
+
+                future.add_done_callback(evict_on_failure)
+            return await asyncio.shield(future)
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from functools import cached_property, lru_cache
+from typing import Annotated, Any
 
 from attr import dataclass
 from numpy.typing import NDArray
 import numpy as np
 from openai import AsyncOpenAI
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 
 
 
@@ -14,18 +15,12 @@ class Question(BaseModel):
     question: str = Field(description="The question being asked.")
 
 
-class Answer(BaseModel):
-    id: int = Field(description="The unique identifier for the question.")
-    answer: float = Field(
-        description="The numeric answer to the question. If it is yes/no, use 1.0/0.0.",
-        ge=-1.0,
-        le=1.0,
-    )
-
-
 class Context(BaseModel):
-    answers: list[Answer] = Field(
-        description="List of answers associated with the context."
+    values: list[Annotated[float, Field(ge=-1.0, le=1.0)]] = Field(
+        description=(
+            "Numeric answers to the questions, in the order the questions are "
+            "listed. If a question is yes/no, use 1.0/0.0."
+        )
     )
     feedback: float = Field(
         description="Evaluate sentiment feedback of previous interaction in the range [-1.0, 1.0].",
@@ -34,10 +29,30 @@ class Context(BaseModel):
     )
 
     @property
-    def feature_vector(self) -> NDArray[np.float64]:
-        """Convert the context answers to a feature vector."""
-        sorted_answers = sorted(self.answers, key=lambda ans: ans.id)
-        return np.array([ans.answer for ans in sorted_answers], dtype=np.float64)
+    def feature_vector(self) -> NDArray[np.float32]:
+        """Convert the context answers to a feature vector.
+
+        Answers are positional, so the vector is a direct conversion of
+        `values`.
+        """
+        return np.asarray(self.values, dtype=np.float32)
+
+
+@lru_cache
+def _context_model(context_length: int) -> type[Context]:
+    """Build a `Context` response format with exactly one value per question."""
+    return create_model(
+        "Context",
+        __base__=Context,
+        values=(
+            Context.model_fields["values"].annotation,
+            Field(
+                description=Context.model_fields["values"].description,
+                min_length=context_length,
+                max_length=context_length,
+            ),
+        ),
+    )
 
 
 class ContextExtractor(ABC):
@@ -64,23 +79,29 @@ class QuestionBasedContextExtractor(ContextExtractor):
     def context_length(self) -> int:
         return len(self.questions)
 
-    async def extract(self, input_text: str) -> Context:
-        response = await self.llm_client.responses.parse(
-            model=self.model_name,
-            instructions=f"""
+    @cached_property
+    def _instructions(self) -> str:
+        """Prompt for the extractor; the questions are fixed, so build it once."""
+        return f"""
             <Instructions>
                 <Instruction>
                     You are given a piece of text input. Your task is to answer the following questions based on the content of the input.
                     Provide numeric answers in the range [-1.0, 1.0]. For yes/no questions, use 1.0 for 'yes' and 0.0 for 'no'.
+                    Return exactly one value per question, in the same order as the questions are listed.
                     Additionally, provide a sentiment feedback score for the overall sentiment of the input text, also in the range [-1.0, 1.0].
                     <Questions>
                         {"".join(f'<Question id="{id}">{q}</Question>' for id, q in enumerate(self.questions, start=1))}
                     </Questions>
                 </Instruction>
             </Instructions>
-            """,
+            """
+
+    async def extract(self, input_text: str) -> Context:
+        response = await self.llm_client.responses.parse(
+            model=self.model_name,
+            instructions=self._instructions,
             input=input_text,
-            text_format=Context,
+            text_format=_context_model(self.context_length),
             **self.api_kwargs,
         )
         return response.output_parsed
@@ -2,12 +2,11 @@ from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pytest
 
-from mcpbandit.bandit import ArmState, ThompsonSamplingRegistry, UCBRegistry
+from mcpbandit.bandit import Arm, ArmState, ThompsonSamplingRegistry, UCBRegistry
 
 
 def _simulate(registry_factory: callable, *, rounds: int = 400) -> np.ndarray:
     """Run a registry against two arms with binary 5-D contexts."""
-    np.random.seed(0)
     rng = np.random.default_rng(1)
 
     context_dim = 5
@@ -36,7 +35,7 @@ def _simulate(registry_factory: callable, *, rounds: int = 400) -> np.ndarray:
         (
             "thompson",
             lambda context_dim: ThompsonSamplingRegistry(
-                context_length=context_dim, alpha=0.3
+                context_length=context_dim, alpha=0.3, rng=np.random.default_rng(0)
             ),
         ),
         (
@@ -79,5 +78,93 @@ def test_linear_bandit_arm_state_update_is_thread_safe() -> None:
     for idx in applied_order:
         expected.update(float(rewards[idx]), contexts[idx])
 
-    assert np.allclose(threaded.L, expected.L)
-    assert np.allclose(threaded.b, expected.b)
+    assert np.allclose(threaded.A, expected.A, atol=1e-5)
+    assert np.allclose(threaded.b, expected.b, atol=1e-5)
+
+
+def test_arm_state_mu_hat_is_refreshed_after_update() -> None:
+    dim = 3
+    rng = np.random.default_rng(7)
+    state = ArmState.initial(dim)
+    assert np.allclose(state.get_mu_hat(), 0.0)
+
+    contexts = rng.standard_normal((10, dim))
+    rewards = rng.standard_normal(10)
+    for context, reward in zip(contexts, rewards):
+        state.update(float(reward), context)
+
+    A = np.identity(dim) + contexts.T @ contexts
+    assert np.allclose(state.A, A, atol=1e-5)
+    expected = np.linalg.solve(A, contexts.T @ rewards)
+    assert np.allclose(state.get_mu_hat().ravel(), expected, atol=1e-5)
+    assert np.allclose(state.get_A_inv(), np.linalg.inv(A), atol=1e-5)
+    assert state.get_mu_hat() is state.get_mu_hat()
+
+
+@pytest.mark.parametrize("registry_cls", [ThompsonSamplingRegistry, UCBRegistry])
+@pytest.mark.parametrize("length", [3, 8])
+def test_select_rejects_context_of_wrong_length(
+    registry_cls: type, length: int
+) -> None:
+    registry = registry_cls(context_length=5)
+    registry.add(body=None)
+    with pytest.raises(ValueError, match="shape"):
+        registry.select(np.ones(length))
+
+
+def test_selection_follows_arm_state_updated_directly() -> None:
+    registry = UCBRegistry(context_length=2, alpha=0.0)
+    registry.add(body="a")
+    registry.add(body="b")
+    context = np.array([1.0, 0.0])
+    registry.observe(0, 0.5, context)
+    assert registry.select(context).body == "a"
+
+    for _ in range(5):
+        registry.arms[1].state.update(1.0, context)
+    assert registry.select(context).body == "b"
+
+    registry.arms.append(
+        Arm(id=2, body="c", state=ArmState.initial(registry.context_length))
+    )
+    for _ in range(5):
+        registry.arms[2].state.update(2.0, context)
+    assert registry.select(context).body == "c"
+
+
+def test_thompson_noise_pool_refills_without_reusing_rows(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("mcpbandit.bandit._NOISE_POOL_ROWS", 4)
+    registry = ThompsonSamplingRegistry(
+        context_length=3, rng=np.random.default_rng(7)
+    )
+    draws = np.concatenate([registry._draw_noise(2).copy() for _ in range(5)])
+
+    reference_rng = np.random.default_rng(7)
+    expected = np.concatenate(
+        [reference_rng.standard_normal((4, 3), dtype=np.float32) for _ in range(3)]
+    )[:10]
+    assert np.array_equal(draws, expected)
+    assert len(np.unique(draws, axis=0)) == len(draws)
+
+
+def test_thompson_decisions_are_reproducible_with_seeded_rng() -> None:
+    def run() -> list[int]:
+        registry = ThompsonSamplingRegistry(
+            context_length=5, alpha=1.0, rng=np.random.default_rng(42)
+        )
+        for _ in range(3):
+            registry.add(body=None)
+        rng = np.random.default_rng(3)
+        chosen = []
+        for _ in range(200):
+            context = rng.integers(0, 2, size=5).astype(float)
+            arm = registry.select(context)
+            registry.observe(arm.id, float(rng.random()), context)
+            chosen.append(arm.id)
+        return chosen
+
+    first = run()
+    assert first == run()
+    assert len(set(first)) > 1
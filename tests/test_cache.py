@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from mcpbandit.cache import async_lru_cache
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_by_normalized_arguments() -> None:
+    calls: list[tuple[int, int]] = []
+
+    @async_lru_cache(maxsize=8)
+    async def add(a: int, *, b: int = 0, c: int = 0) -> int:
+        calls.append((a, b + c))
+        return a + b + c
+
+    assert await add(1, b=2, c=3) == 6
+    assert await add(1, c=3, b=2) == 6
+    assert calls == [(1, 5)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution() -> None:
+    calls = 0
+
+    @async_lru_cache(maxsize=8)
+    async def slow(x: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return x * 2
+
+    results = await asyncio.gather(*(slow(3) for _ in range(5)))
+    assert results == [6] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_not_cached() -> None:
+    attempts = 0
+
+    @async_lru_cache(maxsize=8)
+    async def flaky(x: int) -> int:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("transient failure")
+        return x
+
+    with pytest.raises(RuntimeError):
+        await flaky(1)
+    assert await flaky(1) == 1
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted() -> None:
+    calls: list[int] = []
+
+    @async_lru_cache(maxsize=2)
+    async def identity(x: int) -> int:
+        calls.append(x)
+        return x
+
+    await identity(1)
+    await identity(2)
+    await identity(1)  # 1 becomes most recently used
+    await identity(3)  # evicts 2
+    await identity(1)
+    await identity(2)
+    assert calls == [1, 2, 3, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_first_caller_does_not_cancel_shared_call() -> None:
+    calls = 0
+
+    @async_lru_cache(maxsize=8)
+    async def slow(x: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return x + 1
+
+    first = asyncio.create_task(slow(1))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(slow(1))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 2
+    assert first.cancelled()
+    assert await slow(1) == 2
+    assert calls == 1
@@ -2,8 +2,9 @@ import pytest
 import pytest_asyncio
 import numpy as np
 from openai import AsyncOpenAI
+from pydantic import ValidationError
 
-from mcpbandit.context import Context, QuestionBasedContextExtractor
+from mcpbandit.context import Context, QuestionBasedContextExtractor, _context_model
 
 
 @pytest.fixture
@@ -35,11 +36,12 @@ async def context(extractor: QuestionBasedContextExtractor) -> Context:
 
 
 @pytest.mark.asyncio
-async def test_feature_vector_orders_answers_by_id(context: Context) -> None:
-    sorted_answers = sorted(context.answers, key=lambda ans: ans.id)
-    expected_vector = np.array([ans.answer for ans in sorted_answers], dtype=np.float64)
+async def test_feature_vector_follows_question_order(
+    extractor: QuestionBasedContextExtractor, context: Context
+) -> None:
+    expected_vector = np.array(context.values, dtype=np.float32)
     assert np.array_equal(context.feature_vector, expected_vector)
-    assert context.feature_vector.shape == (len(sorted_answers),)
+    assert context.feature_vector.shape == (extractor.context_length,)
 
 
 @pytest.mark.asyncio
@@ -49,10 +51,35 @@ async def test_question_based_extractor_answers_correctly(
     expected_yes = {1, 2, 5}
     expected_no = {3, 4}
 
-    for ans in context.answers:
-        if ans.id in expected_yes:
-            assert ans.answer > 0.5, f"Question {ans.id} should be yes-ish"
-        if ans.id in expected_no:
-            assert ans.answer < 0.5, f"Question {ans.id} should be no-ish"
+    for question_id, value in enumerate(context.values, start=1):
+        if question_id in expected_yes:
+            assert value > 0.5, f"Question {question_id} should be yes-ish"
+        if question_id in expected_no:
+            assert value < 0.5, f"Question {question_id} should be no-ish"
 
     assert -1.0 <= context.feedback <= 1.0
+
+
+def test_context_model_requires_one_value_per_question() -> None:
+    model = _context_model(3)
+    model(values=[1.0, 0.0, 0.5], feedback=0.0)
+    for values in ([1.0, 0.0], [1.0, 0.0, 0.5, 0.2]):
+        with pytest.raises(ValidationError):
+            model(values=values, feedback=0.0)
+
+
+def test_feature_vector_is_float32() -> None:
+    context = Context(values=[1.0, 0.0, 0.5], feedback=0.0)
+    vector = context.feature_vector
+    assert vector.dtype == np.float32
+    assert np.array_equal(vector, np.array([1.0, 0.0, 0.5], dtype=np.float32))
+
+
+def test_feature_vector_follows_updated_values() -> None:
+    context = Context(values=[1.0, 0.0, 0.5], feedback=0.0)
+    context.values = [0.0, 1.0]
+    assert np.array_equal(
+        context.feature_vector, np.array([0.0, 1.0], dtype=np.float32)
+    )
+    copied = context.model_copy(update={"values": [0.25]})
+    assert np.array_equal(copied.feature_vector, np.array([0.25], dtype=np.float32))